@@ -45,6 +45,7 @@ class LayerFragBase(LayerBase):
             p.id for p in self._buildings.values() if p.relation in [-1, 0]
         )
         self._generated_lines: dict[int, Image.Image] = {}
+        self._placements: Optional[list] = None
 
     def draw(self, game_time: int, image: Image.Image):
         """Draws the frags on the image.
@@ -54,9 +55,24 @@ class LayerFragBase(LayerBase):
             image (Image.Image): The image where the logs will be drawn into.
         """
         evt_flag = self._replay_data.events[game_time].evt_frag
-        self._base = Image.new("RGBA", (560, 50))
-        self._frags.extend(evt_flag)
 
+        if evt_flag or self._placements is None:
+            self._frags.extend(evt_flag)
+            self._placements = list(self._get_placements(image))
+
+        for img, xy in self._placements:
+            image.alpha_composite(img, xy)
+
+    def _get_placements(self, image: Image.Image):
+        """Builds the images of the last frags and where they go. This only
+        changes when there's a new frag, so the result is reused until then.
+
+        Args:
+            image (Image.Image): The image where the logs will be drawn into.
+
+        Yields:
+            tuple[Image.Image, tuple[int, int]]: The line and its position.
+        """
         if not self._renderer.enable_chat:
             y_pos = image.height - 5
         else:
@@ -239,7 +255,7 @@ class LayerFragBase(LayerBase):
             for img in self.build(line):
                 y_pos -= img.height
                 x_pos = (image.width - 30) - img.width
-                image.alpha_composite(img, (x_pos, y_pos))
+                yield img, (x_pos, y_pos)
 
     def _hash(self, line):
         """Hashes the line for caching.
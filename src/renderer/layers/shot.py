@@ -1,10 +1,12 @@
+from math import ceil, floor
 from typing import Optional
 from renderer.base import LayerBase
 from renderer.const import COLORS_NORMAL
 from ..data import ReplayData
 from renderer.render import Renderer
-from renderer.utils import flip_y, getEquidistantPoints
+from renderer.utils import flip_y
 
+import numpy as np
 from PIL import ImageDraw, Image, ImageColor
 
 
@@ -66,20 +68,19 @@ class LayerShotBase(LayerBase):
         if not events[game_time].evt_shot and not self._projectiles:
             return
 
-        base = Image.new("RGBA", image.size)
-        draw = ImageDraw.Draw(base)
-
         for shot in events[game_time].evt_shot:
-            result = getEquidistantPoints(
-                flip_y(shot.origin),
-                flip_y(shot.destination),
-                shot.t_time,
+            points = np.round(
+                np.linspace(
+                    flip_y(shot.origin),
+                    flip_y(shot.destination),
+                    shot.t_time + 1,
+                )
             )
+            result = self._renderer.get_scaled_batch(points, False).tolist()
             p = self._projectiles.setdefault(shot.shot_id, [])
             prev_x, prev_y = self._renderer.get_scaled(shot.origin)
 
             for (x, y) in result:
-                x, y = self._renderer.get_scaled((x, y), False)
                 p.append(
                     (
                         shot.owner_id,
@@ -93,6 +94,7 @@ class LayerShotBase(LayerBase):
                 prev_x, prev_y = x, y
 
         projectiles = []
+        lines = []
 
         for sid in list(self._projectiles):
             if projectile := self._projectiles.get(sid, None):
@@ -179,12 +181,27 @@ class LayerShotBase(LayerBase):
                     else:
                         raise ValueError("Not a valid color")
                     color = tuple(color)
-                draw.line(
-                    [(cx, cy), (px, py)],
-                    fill=color,
-                    width=2,
-                    )
+                lines.append(([(cx, cy), (px, py)], color))
             except KeyError:
                 pass
 
-        image.alpha_composite(base)
+        if not lines:
+            return
+
+        base = Image.new("RGBA", image.size)
+        draw = ImageDraw.Draw(base)
+
+        for xy, color in lines:
+            draw.line(xy, fill=color, width=2)
+
+        # Only the area covered by the tracers, with room for the line width,
+        # is composited instead of the whole minimap.
+        xs = [x for xy, _ in lines for x, _ in xy]
+        ys = [y for xy, _ in lines for _, y in xy]
+        x0 = max(floor(min(xs)) - 2, 0)
+        y0 = max(floor(min(ys)) - 2, 0)
+        x1 = min(ceil(max(xs)) + 3, image.width)
+        y1 = min(ceil(max(ys)) + 3, image.height)
+
+        if x0 < x1 and y0 < y1:
+            image.alpha_composite(base, (x0, y0), (x0, y0, x1, y1))
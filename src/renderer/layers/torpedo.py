@@ -2,7 +2,7 @@ from renderer.base import LayerBase
 from renderer.const import COLORS_NORMAL
 from renderer.render import Renderer
 from renderer.utils import flip_y
-from PIL import ImageDraw
+from PIL import Image, ImageDraw
 from math import cos, sin, radians, degrees
 from typing import Optional
 from renderer.data import AcousticTorpedo, ReplayData, Torpedo
@@ -42,12 +42,12 @@ class LayerTorpedoBase(LayerBase):
         self._hits: set[int] = set()
         self._acoustic_torpedo_buf: dict[int, AcousticTorpedo] = {}
 
-    def draw(self, game_time: int, draw: ImageDraw.ImageDraw):
+    def draw(self, game_time: int, image: Image.Image):
         """This draws the torpedoes to the minimap.
 
         Args:
             game_time (int): The game time.
-            draw (ImageDraw.ImageDraw): Draw.
+            image (Image.Image): Image to draw the torpedoes to.
         """
         events = self._replay_data.events[game_time]
         self._hits.update(events.evt_hits)
@@ -55,6 +55,8 @@ class LayerTorpedoBase(LayerBase):
         if not events.evt_torpedo and not self._active_torpedoes:
             return
 
+        draw = ImageDraw.Draw(image)
+
         for hit in self._hits.copy():
             try:
                 self._active_torpedoes.pop(hit)
@@ -1,6 +1,7 @@
 from json import JSONDecodeError
 from typing import Any, Callable, Optional, Type, Union
 from importlib import import_module
+from functools import lru_cache
 from renderer.base import LayerBase
 
 from renderer.const import LAYERS
@@ -10,6 +11,8 @@ from renderer.resman import ResourceManager
 from renderer.conman import ConsumableManager
 from renderer.exceptions import MapLoadError
 from renderer.shipbuilder import ShipBuilder
+from renderer.writer import FrameWriter
+import numpy as np
 from PIL import Image, ImageDraw
 from imageio_ffmpeg import write_frames
 from tqdm import tqdm
@@ -17,6 +20,64 @@ from tqdm import tqdm
 Number = Union[int, float]
 
 
+@lru_cache(maxsize=None)
+def _resolve_layer(game_version: str, layer_name: str) -> Type[LayerBase]:
+    """Resolves the layer class, preferring the versioned one if it exists.
+
+    Args:
+        game_version (str): Game version of the replay.
+        layer_name (str): Name of the layer.
+
+    Returns:
+        Type[LayerBase]: The layer class.
+    """
+    versioned_layers_pkg = f"{__package__}.versions.{game_version}"
+    try:
+        mod = import_module(".layers", versioned_layers_pkg)
+        m_layer = getattr(mod, layer_name)
+        LOGGER.info(f"Versioned {layer_name} found. Using that instead.")
+    except (ModuleNotFoundError, AttributeError):
+        mod = import_module(".layers", __package__)
+        m_layer = getattr(mod, f"{layer_name}Base")
+    return m_layer
+
+
+def _make_scaler(
+    scaling: float, minimap_size: int
+) -> Callable[..., tuple[int, int]]:
+    """Creates `get_scaled` for a map, with the map's constants bound.
+
+    Args:
+        scaling (float): Scaling of the map.
+        minimap_size (int): Size of the minimap.
+
+    Returns:
+        Callable[..., tuple[int, int]]: The scaling function.
+    """
+    half = minimap_size / 2
+    scaling_neg = -scaling
+
+    def get_scaled(
+        xy: tuple[Number, Number], flip_y=True
+    ) -> tuple[int, int]:
+        """Scales a coordinate properly.
+
+        Args:
+            xy (tuple[Number, Number]): Coordinate.
+            flip_y (bool, optional): Flips the y component. Defaults to True.
+
+        Returns:
+            tuple[int, int]: Scaled coordinated.
+        """
+        x, y = xy
+        return (
+            round(x * scaling + half),
+            round(y * (scaling_neg if flip_y else scaling) + half),
+        )
+
+    return get_scaled
+
+
 class RendererBase:
     replay_data: ReplayData
     minimap_fg: Image.Image
@@ -24,6 +85,7 @@ class RendererBase:
     minimap_size: int
     minimap_space_size: int
     minimap_scaling: float
+    get_scaled: Callable[..., tuple[int, int]]
     bg_color: tuple[int]
     resman: ResourceManager
     logs: bool
@@ -34,29 +96,37 @@ class RendererBase:
         self.resman = ResourceManager(self.replay_data.game_version)
         self.conman = ConsumableManager([self.replay_data])
 
-    def get_writer(self, path: str, fps: int, quality: int):
+    def get_writer(
+        self, path: str, fps: int, quality: int, preset: Optional[str] = None
+    ) -> FrameWriter:
         m_block = 10
 
         if hasattr(self, "logs"):
             if self.logs:
                 m_block = 17
 
-        return write_frames(
+        output_params = [
+            "-profile:v",
+            "high",
+            "-movflags",
+            "+faststart",
+            "-tune",
+            "animation",
+        ]
+
+        if preset:
+            output_params.extend(["-preset", preset])
+
+        video_writer = write_frames(
             path=path,
             fps=fps,
             quality=quality,
-            pix_fmt_in="rgba",
+            pix_fmt_in="rgb24",
             macro_block_size=m_block,
             size=self.minimap_bg.size,
-            output_params=[
-                "-profile:v",
-                "high",
-                "-movflags",
-                "+faststart",
-                "-tune",
-                "animation",
-            ],
+            output_params=output_params,
         )
+        return FrameWriter(video_writer)
 
     def _load_map(self):
         """Loads the map.
@@ -94,11 +164,41 @@ class RendererBase:
             )
 
             self.bg_color = map_water.getpixel((10, 10))
-            map_water = Image.alpha_composite(map_water, draw_grid())
-            self.minimap_fg = Image.alpha_composite(map_water, map_land)
+            map_water.alpha_composite(draw_grid())
+            map_water.alpha_composite(map_land)
+            self.minimap_fg = map_water
         except (FileNotFoundError, ModuleNotFoundError) as e:
             raise MapLoadError from e
 
+    def _get_bg_parts(
+        self, xy: tuple[int, int]
+    ) -> list[tuple[Image.Image, tuple[int, int]]]:
+        """Gets the parts of the background that are not covered by the
+        minimap when it is pasted at the given position. Only these parts
+        need to be reset every frame.
+
+        Args:
+            xy (tuple[int, int]): Where the minimap is pasted.
+
+        Returns:
+            list[tuple[Image.Image, tuple[int, int]]]: The parts and their
+            positions.
+        """
+        x, y = xy
+        w, h = self.minimap_fg.size
+        bw, bh = self.minimap_bg.size
+        boxes = [
+            (0, 0, bw, y),
+            (0, y, x, y + h),
+            (x + w, y, bw, y + h),
+            (0, y + h, bw, bh),
+        ]
+        return [
+            (self.minimap_bg.crop(box), box[:2])
+            for box in boxes
+            if box[0] < box[2] and box[1] < box[3]
+        ]
+
     def _load_map_manifest(self):
         """Loads the map's metadata and checks its values.
 
@@ -128,27 +228,26 @@ class RendererBase:
         assert isinstance(self.minimap_scaling, float)
         assert 0 < self.minimap_space_size <= 1600
         assert 760 == self.minimap_size
+        self.get_scaled = _make_scaler(self.minimap_scaling, self.minimap_size)
 
-    def get_scaled(
-        self, xy: tuple[Number, Number], flip_y=True
-    ) -> tuple[int, int]:
-        """Scales a coordinate properly.
+    def get_scaled_batch(self, xy: np.ndarray, flip_y=True) -> np.ndarray:
+        """Scales an array of coordinates in one pass.
 
         Args:
-            xy (tuple[Number, Number]): Coordinate.
+            xy (np.ndarray): Coordinates, shaped (N, 2).
             flip_y (bool, optional): Flips the y component. Defaults to True.
 
         Returns:
-            tuple[int, int]: Scaled coordinated.
+            np.ndarray: Scaled coordinates, rounded the same way `get_scaled`
+            rounds them.
         """
-        x, y = xy
+        xy = np.asarray(xy, dtype=np.float64)
 
         if flip_y:
-            y = -y
+            xy = xy * (1, -1)
 
-        x = round(x * self.minimap_scaling + self.minimap_size / 2)
-        y = round(y * self.minimap_scaling + self.minimap_size / 2)
-        return x, y
+        xy = xy * self.minimap_scaling + self.minimap_size / 2
+        return np.rint(xy).astype(np.int64)
 
     def get_scaled_r(self, r: Number):
         """Scales the radius.
@@ -163,17 +262,7 @@ class RendererBase:
 
     def _load_layer(self, layer_name: str) -> Type[LayerBase]:
         assert layer_name in LAYERS
-        versioned_layers_pkg = (
-            f"{__package__}.versions.{self.replay_data.game_version}"
-        )
-        try:
-            mod = import_module(".layers", versioned_layers_pkg)
-            m_layer = getattr(mod, layer_name)
-            LOGGER.info(f"Versioned {layer_name} found. Using that instead.")
-        except (ModuleNotFoundError, AttributeError):
-            mod = import_module(".layers", __package__)
-            m_layer = getattr(mod, f"{layer_name}Base")
-        return m_layer
+        return _resolve_layer(self.replay_data.game_version, layer_name)
 
 
 class RenderDual(RendererBase):
@@ -203,6 +292,7 @@ class RenderDual(RendererBase):
         fps: int = 20,
         quality: int = 7,
         progress_cb: Optional[Callable[[float], Any]] = None,
+        preset: Optional[str] = None,
     ):
         self._load_map()
 
@@ -246,62 +336,68 @@ class RenderDual(RendererBase):
             self, self.replay_r, "red"
         )
 
-        video_writer = self.get_writer(path, fps, quality)
-        video_writer.send(None)
+        with self.get_writer(path, fps, quality, preset) as video_writer:
+            if self.use_tqdm:
+                prog = tqdm(
+                    set(self.replay_data.events).intersection(
+                        self.replay_r.events
+                    )
+                )
+            else:
+                prog = set(self.replay_data.events).intersection(
+                    self.replay_r.events
+                )
 
-        if self.use_tqdm:
-            prog = tqdm(
-                set(self.replay_data.events).intersection(self.replay_r.events)
-            )
-        else:
-            prog = set(self.replay_data.events).intersection(
-                self.replay_r.events
-            )
+            total = len(prog)
+            last_per = 0.0
+
+            # Frame surfaces are allocated once and reset from the base images
+            # every frame.
+            minimap_img = self.minimap_fg.copy()
+            minimap_bg = self.minimap_bg.copy()
+            bg_parts = self._get_bg_parts((40, 90))
 
-        total = len(prog)
-        last_per = 0.0
+            for idx, i in enumerate(prog):
+                if progress_cb:
+                    per = round((idx + 1) / total, 1)
+                    if per > last_per:
+                        last_per = per
+                        progress_cb(per)
 
-        for idx, i in enumerate(prog):
-            if progress_cb:
-                per = round((idx + 1) / total, 1)
-                if per > last_per:
-                    last_per = per
-                    progress_cb(per)
+                self.conman.update(i)
 
-            self.conman.update(i)
+                minimap_img.paste(self.minimap_fg)
 
-            minimap_img = self.minimap_fg.copy()
-            minimap_bg = self.minimap_bg.copy()
-            draw = ImageDraw.Draw(minimap_img)
+                for part, xy in bg_parts:
+                    minimap_bg.paste(part, xy)
 
-            g_capture.draw(i, minimap_img)
-            g_smoke.draw(i, minimap_img)
-            g_score.draw(i, minimap_bg)
-            g_timer.draw(i, minimap_bg)
+                g_capture.draw(i, minimap_img)
+                g_smoke.draw(i, minimap_img)
+                g_score.draw(i, minimap_bg)
+                g_timer.draw(i, minimap_bg)
 
-            g_ward.draw(i, minimap_img)
-            r_ward.draw(i, minimap_img)
+                g_ward.draw(i, minimap_img)
+                r_ward.draw(i, minimap_img)
 
-            g_markers.draw(i, minimap_img)
-            r_markers.draw(i, minimap_img)
+                g_markers.draw(i, minimap_img)
+                r_markers.draw(i, minimap_img)
 
-            g_torpedo.draw(i, draw)
-            r_torpedo.draw(i, draw)
+                g_torpedo.draw(i, minimap_img)
+                r_torpedo.draw(i, minimap_img)
 
-            g_shot.draw(i, minimap_img)
-            r_shot.draw(i, minimap_img)
+                g_shot.draw(i, minimap_img)
+                r_shot.draw(i, minimap_img)
 
-            g_ship.draw(i, minimap_img)
-            r_ship.draw(i, minimap_img)
+                g_ship.draw(i, minimap_img)
+                r_ship.draw(i, minimap_img)
 
-            g_plane.draw(i, minimap_img)
-            r_plane.draw(i, minimap_img)
+                g_plane.draw(i, minimap_img)
+                r_plane.draw(i, minimap_img)
 
-            self.conman.tick()
+                self.conman.tick()
 
-            minimap_bg.paste(minimap_img, (40, 90))
-            video_writer.send(minimap_bg.tobytes())
-        video_writer.close()
+                minimap_bg.paste(minimap_img, (40, 90))
+                video_writer.send(minimap_bg.tobytes("raw", "RGB"))
 
 
 class Renderer(RendererBase):
@@ -370,6 +466,7 @@ class Renderer(RendererBase):
         fps: int = 20,
         quality: int = 7,
         progress_cb: Optional[Callable[[float], Any]] = None,
+        preset: Optional[str] = None,
     ):
         """Starts the rendering process"""
         self._check_if_operations()
@@ -378,116 +475,127 @@ class Renderer(RendererBase):
         assert self.minimap_fg
         assert self.minimap_bg
 
-        layer_ship = self._load_layer("LayerShip")(self)
-        layer_shot = self._load_layer("LayerShot")(self)
-        layer_torpedo = self._load_layer("LayerTorpedo")(self)
-        layer_smoke = self._load_layer("LayerSmoke")(self)
-        layer_plane = self._load_layer("LayerPlane")(self)
-        layer_ward = self._load_layer("LayerWard")(self)
-        layer_building = self._load_layer("LayerBuilding")(self)
-        layer_capture = self._load_layer("LayerCapture")(self)
-        layer_health = self._load_layer("LayerHealth")(self)
-        layer_score = self._load_layer("LayerScore")(self)
-        layer_counter = self._load_layer("LayerCounter")(self)
-        layer_frag = self._load_layer("LayerFrag")(self)
-        layer_timer = self._load_layer("LayerTimer")(self)
-        layer_ribbon = self._load_layer("LayerRibbon")(self)
-        layer_chat = self._load_layer("LayerChat")(self)
-        layer_markers = self._load_layer("LayerMarkers")(self)
-
-        video_writer = self.get_writer(path, fps, quality)
-        video_writer.send(None)
-
-        self._draw_header(self.minimap_bg)
-        last_key = list(self.replay_data.events)[-1]
-
-        if self.use_tqdm:
-            prog = tqdm(self.replay_data.events.keys())
-        else:
-            prog = self.replay_data.events.keys()
-
-        total = len(prog)
-        last_per = 0.0
-
-        for idx, game_time in enumerate(prog):
-            if progress_cb:
-                per = round((idx + 1) / total, 1)
-                if per > last_per:
-                    last_per = per
-                    progress_cb(per)
+        draw_ship = self._load_layer("LayerShip")(self).draw
+        draw_shot = self._load_layer("LayerShot")(self).draw
+        draw_torpedo = self._load_layer("LayerTorpedo")(self).draw
+        draw_smoke = self._load_layer("LayerSmoke")(self).draw
+        draw_plane = self._load_layer("LayerPlane")(self).draw
+        draw_ward = self._load_layer("LayerWard")(self).draw
+        draw_building = self._load_layer("LayerBuilding")(self).draw
+        draw_capture = self._load_layer("LayerCapture")(self).draw
+        draw_health = self._load_layer("LayerHealth")(self).draw
+        draw_score = self._load_layer("LayerScore")(self).draw
+        draw_counter = self._load_layer("LayerCounter")(self).draw
+        draw_frag = self._load_layer("LayerFrag")(self).draw
+        draw_timer = self._load_layer("LayerTimer")(self).draw
+        draw_ribbon = self._load_layer("LayerRibbon")(self).draw
+        draw_chat = self._load_layer("LayerChat")(self).draw
+        draw_markers = self._load_layer("LayerMarkers")(self).draw
+
+        with self.get_writer(path, fps, quality, preset) as video_writer:
+            self._draw_header(self.minimap_bg)
+            last_key = next(reversed(self.replay_data.events))
+
+            if self.use_tqdm:
+                prog = tqdm(self.replay_data.events)
+            else:
+                prog = self.replay_data.events
+
+            total = len(prog)
+            last_per = 0.0
 
+            # Frame surfaces are allocated once and reset from the base images
+            # every frame.
             minimap_img = self.minimap_fg.copy()
             minimap_bg = self.minimap_bg.copy()
 
-            draw = ImageDraw.Draw(minimap_img)
-            self.conman.update(game_time)
+            bg_parts = self._get_bg_parts((40, 90))
 
-            if not self.is_operations:
-                layer_capture.draw(game_time, minimap_img)
-                layer_score.draw(game_time, minimap_bg)
+            # Invariant lookups, bound once for the loop below.
+            base_fg = self.minimap_fg
+            update_consumables = self.conman.update
+            tick_consumables = self.conman.tick
+            send = video_writer.send
 
-            layer_building.draw(game_time, minimap_img)
-            layer_ward.draw(game_time, minimap_img)
-            layer_markers.draw(game_time, minimap_img)
-            layer_shot.draw(game_time, minimap_img)
-            layer_torpedo.draw(game_time, draw)
-            layer_ship.draw(game_time, minimap_img)
-            layer_smoke.draw(game_time, minimap_img)
-            layer_plane.draw(game_time, minimap_img)
-            layer_timer.draw(game_time, minimap_bg)
+            for idx, game_time in enumerate(prog):
+                if progress_cb:
+                    per = round((idx + 1) / total, 1)
+                    if per > last_per:
+                        last_per = per
+                        progress_cb(per)
 
-            if self.logs:
-                layer_health.draw(game_time, minimap_bg)
-                layer_counter.draw(game_time, minimap_bg)
-                layer_frag.draw(game_time, minimap_bg)
-
-                layer_ribbon.draw(game_time, minimap_bg)
-                if self.enable_chat:
-                    layer_chat.draw(game_time, minimap_bg)
-
-            self.conman.tick()
-
-            if game_time == last_key:
-                img_win = Image.new("RGBA", self.minimap_fg.size)
-                drw_win = ImageDraw.Draw(img_win)
-                font = self.resman.load_font("warhelios_bold.ttf", size=48)
-                player = self.replay_data.player_info[
-                    self.replay_data.owner_id
-                ]
-
-                team_id = self.replay_data.game_result.team_id
-
-                match team_id:
-                    case a if a == player.team_id and a != -1:
-                        text = "VICTORY"
-                    case a if a != player.team_id and a != -1:
-                        text = "DEFEAT"
-                    case _:
-                        text = "DRAW"
-
-                tw, th = map(lambda i: i / 2, font.getbbox(text)[2:])
-                mid_x, mid_y = map(lambda i: i / 2, minimap_img.size)
-                offset_y = 6
-                px, py = mid_x - tw, mid_y - th - offset_y
-
-                for i in range(3 * fps):
-                    per = min(1, i / (1.5 * fps))
-                    drw_win.text(
-                        (px, py),
-                        text=text,
-                        font=font,
-                        fill=(255, 255, 255, round(255 * per)),
-                        stroke_width=4,
-                        stroke_fill=(*self.bg_color[:3], round(255 * per)),
-                    )
+                minimap_img.paste(base_fg)
 
-                    minimap_img = Image.alpha_composite(minimap_img, img_win)
+                for part, xy in bg_parts:
+                    minimap_bg.paste(part, xy)
+
+                update_consumables(game_time)
+
+                if not self.is_operations:
+                    draw_capture(game_time, minimap_img)
+                    draw_score(game_time, minimap_bg)
+
+                draw_building(game_time, minimap_img)
+                draw_ward(game_time, minimap_img)
+                draw_markers(game_time, minimap_img)
+                draw_shot(game_time, minimap_img)
+                draw_torpedo(game_time, minimap_img)
+                draw_ship(game_time, minimap_img)
+                draw_smoke(game_time, minimap_img)
+                draw_plane(game_time, minimap_img)
+                draw_timer(game_time, minimap_bg)
+
+                if self.logs:
+                    draw_health(game_time, minimap_bg)
+                    draw_counter(game_time, minimap_bg)
+                    draw_frag(game_time, minimap_bg)
+
+                    draw_ribbon(game_time, minimap_bg)
+                    if self.enable_chat:
+                        draw_chat(game_time, minimap_bg)
+
+                tick_consumables()
+
+                if game_time == last_key:
+                    img_win = Image.new("RGBA", self.minimap_fg.size)
+                    drw_win = ImageDraw.Draw(img_win)
+                    font = self.resman.load_font("warhelios_bold.ttf", size=48)
+                    player = self.replay_data.player_info[
+                        self.replay_data.owner_id
+                    ]
+
+                    team_id = self.replay_data.game_result.team_id
+
+                    match team_id:
+                        case a if a == player.team_id and a != -1:
+                            text = "VICTORY"
+                        case a if a != player.team_id and a != -1:
+                            text = "DEFEAT"
+                        case _:
+                            text = "DRAW"
+
+                    tw, th = map(lambda i: i / 2, font.getbbox(text)[2:])
+                    mid_x, mid_y = map(lambda i: i / 2, minimap_img.size)
+                    offset_y = 6
+                    px, py = mid_x - tw, mid_y - th - offset_y
+
+                    for i in range(3 * fps):
+                        per = min(1, i / (1.5 * fps))
+                        drw_win.text(
+                            (px, py),
+                            text=text,
+                            font=font,
+                            fill=(255, 255, 255, round(255 * per)),
+                            stroke_width=4,
+                            stroke_fill=(*self.bg_color[:3], round(255 * per)),
+                        )
+
+                        minimap_img.alpha_composite(img_win)
+                        minimap_bg.paste(minimap_img, (40, 90))
+                        send(minimap_bg.tobytes("raw", "RGB"))
+                else:
                     minimap_bg.paste(minimap_img, (40, 90))
-                    video_writer.send(minimap_bg.tobytes())
-            else:
-                minimap_bg.paste(minimap_img, (40, 90))
-                video_writer.send(minimap_bg.tobytes())
-        video_writer.close()
+                    send(minimap_bg.tobytes("raw", "RGB"))
 
     def _draw_header(self, image: Image.Image):
         draw = ImageDraw.Draw(image)
@@ -1,12 +1,41 @@
 import json
 
+from functools import lru_cache
 from renderer.utils import LOGGER
-from importlib.resources import open_text, open_binary, is_resource
+from importlib.resources import files, open_binary, is_resource
 from PIL import Image
 from typing import Optional
 from PIL import ImageFont
 
 
+@lru_cache(maxsize=None)
+def _load_json(package: str, filename: str) -> dict:
+    """Parses a json resource once per process. The resources are read-only,
+    so the parsed data is shared by every ResourceManager.
+    """
+    data = files(package).joinpath(filename).read_bytes()
+    return json.loads(data, object_hook=ResourceManager.key_converter)
+
+
+def _decode_image(package: str, filename: str) -> Image.Image:
+    """Decodes an image resource to RGBA."""
+    with open_binary(package, filename) as br:
+        image = Image.open(br)
+        image.load()
+
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    return image
+
+
+@lru_cache(maxsize=64)
+def _load_image(package: str, filename: str) -> Image.Image:
+    """Decodes an image resource once per process. The returned image is
+    shared, so it must only be copied from, never modified.
+    """
+    return _decode_image(package, filename)
+
+
 class ResourceManager:
     """A resource manager."""
 
@@ -42,10 +71,9 @@ class ResourceManager:
             res_package = self._default_res
             res_package = res_package if not path else f"{res_package}.{path}"
 
-        with open_text(res_package, filename) as tr:
-            data = json.load(tr, object_hook=self.key_converter)
-            self._cache[key] = data
-            return data
+        data = _load_json(res_package, filename)
+        self._cache[key] = data
+        return data
 
     def load_font(
         self, filename: str, path: Optional[str] = None, size=12
@@ -117,25 +145,28 @@ class ResourceManager:
             res_package = self._default_res
             res_package = res_package if not path else f"{res_package}.{path}"
 
-        with open_binary(res_package, filename) as br:
-            image = Image.open(br)
-
-            if image.mode != "RGBA":
-                image = image.convert("RGBA")
-            if size:
-                image = image.resize(
-                    size,
-                    Image.Resampling.LANCZOS
-                    if not nearest
-                    else Image.Resampling.NEAREST,
-                )
-            if rot:
-                image = image.rotate(
-                    rot, resample=Image.Resampling.BICUBIC, expand=True
-                )
-
-            self._cache[key_name] = image.copy()
-            return image.copy()
+        # Map textures are megabytes each once decoded and only reused when
+        # the same map is rendered again, so they are kept out of the
+        # process-wide cache.
+        if path and path.startswith("spaces."):
+            image = _decode_image(res_package, filename)
+        else:
+            image = _load_image(res_package, filename)
+
+        if size:
+            image = image.resize(
+                size,
+                Image.Resampling.LANCZOS
+                if not nearest
+                else Image.Resampling.NEAREST,
+            )
+        if rot:
+            image = image.rotate(
+                rot, resample=Image.Resampling.BICUBIC, expand=True
+            )
+
+        self._cache[key_name] = image.copy()
+        return image.copy()
 
     @staticmethod
     def key_converter(o):
@@ -1,6 +1,7 @@
 import logging
 import numpy as np
 
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageColor
 from .data import PlayerInfo
 from .const import COLORS_NORMAL
@@ -18,6 +19,16 @@ LOGGER.setLevel(logging.INFO)
 def draw_grid() -> Image.Image:
     """Draws a grid to the image and returns it.
 
+    Returns:
+        Image.Image: An image with grid on it.
+    """
+    return _draw_grid().copy()
+
+
+@lru_cache(maxsize=None)
+def _draw_grid() -> Image.Image:
+    """The grid is the same for every map, so it is only drawn once.
+
     Returns:
         Image.Image: An image with grid on it.
     """
@@ -30,7 +41,7 @@ def draw_grid() -> Image.Image:
         draw.line([(0, x), (base.width, x)], fill="#ffffff40")
     draw.rectangle((0, 0, base.width - 1, base.height - 1),
                    outline="#ffffff40", width=1)
-    return base.copy()
+    return base
 
 
 def generate_holder(
@@ -157,21 +168,3 @@ def flip_y(n: tuple):
     """
     return n[0], -n[1]
 
-
-def getEquidistantPoints(
-    p1: tuple[float, float], p2: tuple[float, float], parts: int
-):
-    """Generates equidistant points.
-
-    Args:
-        p1 (tuple[float, float]): Point 1
-        p2 (tuple[float, float]): Point 2
-        parts (int): Number of points between point 1 & 2.
-
-    Returns:
-        _type_: An iterator the iterates the points between 1 & 2.
-    """
-    return zip(
-        np.round(np.linspace(p1[0], p2[0], parts + 1)),
-        np.round(np.linspace(p1[1], p2[1], parts + 1)),
-    )
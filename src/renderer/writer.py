@@ -0,0 +1,93 @@
+from queue import Queue
+from threading import Thread
+from typing import Generator, Optional
+
+
+class FrameWriter:
+    """Feeds rendered frames to the video writer from a worker thread.
+
+    The layers carry state from one frame to the next, so frames have to be
+    rendered in order. What can overlap is the encoding: while ffmpeg drains
+    the previous frames from its pipe, the next frames are rendered.
+    """
+
+    def __init__(self, video_writer: Generator, max_pending: int = 2):
+        """Initializes this class.
+
+        Args:
+            video_writer (Generator): The writer from `write_frames`.
+            max_pending (int, optional): How many frames can be waiting for
+            the writer before rendering is blocked. Defaults to 2.
+        """
+        self._video_writer = video_writer
+        self._video_writer.send(None)
+        self._queue: Queue[Optional[bytes]] = Queue(maxsize=max_pending)
+        self._error: Optional[Exception] = None
+        self._aborted = False
+        self._thread = Thread(target=self._write, daemon=True)
+        self._thread.start()
+
+    def _write(self):
+        """Writes the queued frames until `None` is received. After an error
+        or an abort the frames are still consumed, so `send` never blocks on
+        a full queue, but they are dropped.
+        """
+        while (frame := self._queue.get()) is not None:
+            if self._error or self._aborted:
+                continue
+
+            try:
+                self._video_writer.send(frame)
+            except Exception as e:
+                self._error = e
+
+    def send(self, frame: bytes):
+        """Queues the frame to be written.
+
+        Args:
+            frame (bytes): The frame's raw bytes.
+
+        Raises:
+            Exception: The error from the writer, if it failed.
+        """
+        if self._error:
+            raise self._error
+
+        self._queue.put(frame)
+
+    def _stop(self):
+        """Stops the worker thread and closes the writer, which stops ffmpeg.
+        """
+        try:
+            self._queue.put(None)
+            self._thread.join()
+        finally:
+            self._video_writer.close()
+
+    def close(self):
+        """Waits for the queued frames to be written and closes the writer.
+
+        Raises:
+            Exception: The error from the writer, if it failed.
+        """
+        self._stop()
+
+        if self._error:
+            raise self._error
+
+    def abort(self):
+        """Drops the frames that are not written yet and closes the writer.
+        Used when rendering fails, so ffmpeg and the worker thread are not
+        left running.
+        """
+        self._aborted = True
+        self._stop()
+
+    def __enter__(self) -> "FrameWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,146 @@
+import pytest
+import threading
+
+from renderer.render import Renderer
+from renderer.writer import FrameWriter
+from src.replay_parser import ReplayParser
+
+
+class WriteError(Exception):
+    pass
+
+
+class RenderError(Exception):
+    pass
+
+
+class StubWriter:
+    """Stands in for the generator from `write_frames`."""
+
+    def __init__(self, error=None, release=None):
+        self.frames = []
+        self.closed = False
+        self.error = error
+        self.release = release
+
+    def generator(self):
+        try:
+            while True:
+                frame = yield
+
+                if self.release:
+                    self.release.wait()
+
+                if self.error:
+                    raise self.error
+
+                self.frames.append(frame)
+        finally:
+            self.closed = True
+
+
+def run_with_timeout(target):
+    """Runs `target` on a thread, so a deadlock fails the test instead of
+    hanging it. Returns the exception raised by `target`, if any.
+    """
+    errors = []
+
+    def run():
+        try:
+            target()
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    return errors[0] if errors else None
+
+
+def test_close_writes_frames():
+    stub = StubWriter()
+    writer = FrameWriter(stub.generator())
+
+    for frame in (b"a", b"b", b"c"):
+        writer.send(frame)
+    writer.close()
+
+    assert stub.frames == [b"a", b"b", b"c"]
+    assert stub.closed
+    assert not writer._thread.is_alive()
+
+
+def test_abort_closes_writer():
+    stub = StubWriter()
+    writer = FrameWriter(stub.generator())
+
+    writer.send(b"a")
+    writer.abort()
+
+    assert stub.closed
+    assert not writer._thread.is_alive()
+
+
+def test_error_is_raised_from_send():
+    error = WriteError()
+    stub = StubWriter(error=error)
+    writer = FrameWriter(stub.generator(), max_pending=1)
+
+    def send_frames():
+        # With one pending frame, the error is recorded before the third
+        # send returns, so it comes back from the fourth at the latest.
+        for _ in range(4):
+            writer.send(b"frame")
+
+    assert run_with_timeout(send_frames) is error
+    assert run_with_timeout(writer.abort) is None
+    assert stub.closed
+
+
+def test_error_is_raised_from_close():
+    error = WriteError()
+    stub = StubWriter(error=error)
+    writer = FrameWriter(stub.generator())
+
+    writer.send(b"frame")
+
+    with pytest.raises(WriteError) as info:
+        writer.close()
+
+    assert info.value is error
+    assert stub.closed
+    assert not writer._thread.is_alive()
+
+
+def test_full_queue_after_error_does_not_block():
+    release = threading.Event()
+    stub = StubWriter(error=WriteError(), release=release)
+    writer = FrameWriter(stub.generator(), max_pending=1)
+
+    # The first frame holds the worker until it is released, the second
+    # fills the queue.
+    writer.send(b"a")
+    writer.send(b"b")
+    release.set()
+
+    assert isinstance(run_with_timeout(writer.close), WriteError)
+    assert stub.closed
+
+
+def test_failed_render_stops_writer(tmp_path):
+    def progress_cb(per: float):
+        raise RenderError
+
+    with open("replays/123.wowsreplay", "rb") as f:
+        replay_info = ReplayParser(
+            f, strict=True, raw_data_output=False
+        ).get_info()
+
+    renderer = Renderer(replay_info["hidden"]["replay_data"])
+    threads = threading.active_count()
+
+    with pytest.raises(RenderError):
+        renderer.start(str(tmp_path / "minimap.mp4"), progress_cb=progress_cb)
+
+    assert threading.active_count() == threads